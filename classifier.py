@@ -1,149 +1,796 @@
 #!/usr/bin/env python3
 
+import asyncio
+import bisect
+import functools
+import importlib.util
+import io
 import json
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 try:
     import openai
 except ImportError:
     openai = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
     
 try:
     import anthropic
 except ImportError:
     anthropic = None
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from classifier_cache import json_loads, make_cache_key
 from config import AI_CONFIG, KEYWORD_CONFIG
 
+SYSTEM_PROMPT_GPT = """You rate tweets 1-10 for importance to the context given in each message:
+- Announcements, earnings: 9-10
+- Tech updates, news: 7-8  
+- Insights, commentary: 5-6
+- Social, memes: 1-4
+
+Respond with JSON only: {"score": X, "reason": "brief explanation"}
+For a JSON array of tweets: {"results": [{"id": 1, "score": X, "reason": "brief explanation"}, ...]}"""
+
+SYSTEM_PROMPT_CLAUDE = """You rate tweets 1-10 for importance to the context that follows:
+- Announcements, earnings: 9-10
+- Tech updates, breakthroughs: 7-8
+- Industry insights: 5-6
+- Social, memes: 1-4
+
+Respond with JSON only: {"score": X, "reason": "brief explanation"}
+For a JSON array of tweets: {"results": [{"id": 1, "score": X, "reason": "brief explanation"}, ...]}"""
+
+# Anthropic caches the system block across requests once it is long enough
+CLAUDE_SYSTEM = [{"type": "text", "text": SYSTEM_PROMPT_CLAUDE, "cache_control": {"type": "ephemeral"}}]
+
+
+@functools.lru_cache(maxsize=None)
+def claude_system(context):
+    # The handle context is its own cached block after the rubric, so every
+    # request for a handle reuses the same prefix and only the tweets are new input
+    return CLAUDE_SYSTEM + [{"type": "text", "text": f"Context: {context}", "cache_control": {"type": "ephemeral"}}]
+
+RATING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "description": "importance from 1 to 10"},
+        "reason": {"type": "string", "description": "brief explanation"}
+    },
+    "required": ["score", "reason"],
+    "additionalProperties": False
+}
+
+# Forcing this tool in strict mode makes GPT return schema-valid arguments instead of free text
+RATE_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "rate",
+        "description": "Record the tweet's importance rating",
+        "strict": True,
+        "parameters": RATING_SCHEMA
+    }
+}
+
+# Structured output for batch replies, so the server guarantees parseable JSON
+BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "tweet_ratings",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"id": {"type": "integer"}, **RATING_SCHEMA["properties"]},
+                        "required": ["id", "score", "reason"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["results"],
+            "additionalProperties": False
+        }
+    }
+}
+
+PROVIDER_LABELS = {"gpt": "GPT", "claude": "Claude"}
+
+# Ordered from highest to lowest priority
+KEYWORD_CATEGORIES = ("high_priority", "company_keywords", "tech_keywords")
+
+HIGH_PRIORITY_KEYWORDS = tuple(keyword.lower() for keyword in KEYWORD_CONFIG["high_priority"])
+COMPANY_KEYWORDS = tuple(keyword.lower() for keyword in KEYWORD_CONFIG["company_keywords"])
+TECH_KEYWORDS = tuple(keyword.lower() for keyword in KEYWORD_CONFIG["tech_keywords"])
+
+KEYWORDS = {
+    "high_priority": HIGH_PRIORITY_KEYWORDS,
+    "company_keywords": COMPANY_KEYWORDS,
+    "tech_keywords": TECH_KEYWORDS
+}
+
+# One alternation per category; used when pyahocorasick is unavailable
+KEYWORD_PATTERNS = {
+    category: re.compile("|".join(re.escape(keyword) for keyword in KEYWORDS[category]))
+    for category in KEYWORD_CATEGORIES
+}
+
+
+PREPARED_FIELDS = ('_text_lower', '_is_retweet', '_is_pinned')
+
+
+def prepare_tweet(tweet_data):
+    tweet_data['_text_lower'] = (tweet_data.get('text') or '').lower()
+    tweet_data['_is_retweet'] = bool(tweet_data.get('is_retweet'))
+    tweet_data['_is_pinned'] = bool(tweet_data.get('is_pinned'))
+    return tweet_data
+
+
+def strip_prepared(tweet_data):
+    for field in PREPARED_FIELDS:
+        tweet_data.pop(field, None)
+    return tweet_data
+
+
+@functools.lru_cache(maxsize=None)
+def get_openai_client(api_key):
+    # Shared per API key so every classifier reuses one keep-alive pool
+    http_client = None
+    if httpx:
+        http_client = openai.DefaultHttpxClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+        )
+    return openai.OpenAI(api_key=api_key, max_retries=AI_CONFIG["gpt"]["max_retries"], http_client=http_client)
+
+
+@functools.lru_cache(maxsize=None)
+def get_anthropic_client(api_key):
+    return anthropic.Anthropic(api_key=api_key, max_retries=AI_CONFIG["claude"]["max_retries"])
+
+
+# Errors that retrying can't fix; the SDK clients already retry timeouts, 429s and 5xx with backoff
+FATAL_API_ERRORS = tuple(
+    getattr(module, name)
+    for module in (openai, anthropic) if module
+    for name in ("AuthenticationError", "PermissionDeniedError")
+)
+
+
+if msgspec:
+    class RateOutput(msgspec.Struct):
+        score: int
+        reason: str
+
+
+def coerce_score(value):
+    # Accepts 8, 7.6 or "8" and clamps to 1-10; anything else is None
+    if isinstance(value, bool):
+        return None
+    try:
+        score = int(round(float(value)))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return min(10, max(1, score))
+
+
+def parse_rating(raw, label):
+    # Free-text JSON replies have no schema behind them, so fields are coerced and defaulted
+    result = json_loads(raw)
+    score = coerce_score(result.get('score', 5))
+    reason = result.get('reason')
+    return 5 if score is None else score, f'{label} classification' if reason is None else str(reason)
+
+
+def parse_tool_rating(raw):
+    # The rate tool is schema-enforced, so an off-schema reply is a real failure
+    if msgspec:
+        rating = msgspec.json.decode(raw, type=RateOutput)
+        return min(10, max(1, rating.score)), rating.reason
+    return parse_rating(raw, "GPT")
+
+
+def tool_arguments(chunk):
+    if chunk.choices and chunk.choices[0].delta.tool_calls:
+        function = chunk.choices[0].delta.tool_calls[0].function
+        return function.arguments if function else None
+    return None
+
+
+def _write_json_piece(buffer, piece):
+    if not piece:
+        return
+    if buffer.tell() == 0:
+        piece = piece.lstrip()
+        if piece and piece[0] != '{':
+            raise ValueError(f"Response is not JSON: {piece[:30]!r}")
+    buffer.write(piece)
+
+
+def collect_json(pieces):
+    # Accumulates a streamed reply, bailing out as soon as it clearly isn't JSON
+    buffer = io.StringIO()
+    for piece in pieces:
+        _write_json_piece(buffer, piece)
+    return buffer.getvalue()
+
+
+async def collect_json_async(pieces):
+    buffer = io.StringIO()
+    async for piece in pieces:
+        _write_json_piece(buffer, piece)
+    return buffer.getvalue()
+
+
+def build_keyword_automaton():
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for rank, category in enumerate(KEYWORD_CATEGORIES):
+        for keyword in KEYWORDS[category]:
+            if keyword not in automaton:
+                automaton.add_word(keyword, (rank, category, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+class RateLimiter:
+    
+    def __init__(self, max_requests_per_minute, max_tokens_per_minute):
+        self.max_requests = max_requests_per_minute
+        self.max_tokens = max_tokens_per_minute
+        self.available_requests = max_requests_per_minute
+        self.available_tokens = max_tokens_per_minute
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.available_requests = min(self.max_requests, self.available_requests + self.max_requests * elapsed / 60)
+        self.available_tokens = min(self.max_tokens, self.available_tokens + self.max_tokens * elapsed / 60)
+        self.last_update = now
+    
+    async def acquire(self, tokens):
+        tokens = min(tokens, self.max_tokens)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                await asyncio.sleep(0.05)
+
 
 class TweetClassifier:
     
-    def __init__(self, ai_provider="gpt"):
+    KEYWORD_AUTOMATON = build_keyword_automaton()
+    
+    def __init__(self, ai_provider="gpt", cache=None, semantic_cache=None):
         self.ai_provider = ai_provider
         self.openai_client = None
         self.anthropic_client = None
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        self.stats = {"hits": 0, "misses": 0, "semantic_hits": 0, "keyword_shortcuts": 0}
+        self._config = AI_CONFIG.get(ai_provider)
+        self._gpt_config = AI_CONFIG["gpt"]
+        self._claude_config = AI_CONFIG["claude"]
+        # Bounds in-flight batch requests across every thread sharing this classifier
+        self._request_slots = threading.BoundedSemaphore(self._config["max_concurrent"] if self._config else 1)
         self._init_ai_clients()
+        self._classify_fn = {
+            "gpt": self.classify_with_gpt,
+            "claude": self.classify_with_claude
+        }.get(ai_provider, self._classify_unknown)
+        self._is_available_fn = {
+            "gpt": lambda: self.openai_client is not None,
+            "claude": lambda: self.anthropic_client is not None
+        }.get(ai_provider, lambda: False)
     
     def _init_ai_clients(self):
         if self.ai_provider == "gpt" and openai:
             api_key = os.getenv('OPENAI_API_KEY')
             if api_key:
-                self.openai_client = openai.OpenAI(api_key=api_key)
+                self.openai_client = get_openai_client(api_key)
             else:
                 print("Warning: OPENAI_API_KEY not found in environment")
         
         elif self.ai_provider == "claude" and anthropic:
             api_key = os.getenv('ANTHROPIC_API_KEY')
             if api_key:
-                self.anthropic_client = anthropic.Anthropic(api_key=api_key)
+                self.anthropic_client = get_anthropic_client(api_key)
             else:
                 print("Warning: ANTHROPIC_API_KEY not found in environment")
     
-    def classify_with_gpt(self, tweet_data, context):
-        if not self.openai_client:
-            return 5, "GPT client not available"
+    def _create_async_client(self):
+        # Async clients are created per batch so their connection pool is
+        # bound to the event loop that asyncio.run() starts for that batch.
+        if self.ai_provider == "gpt" and self.openai_client:
+            return openai.AsyncOpenAI(api_key=self.openai_client.api_key, max_retries=AI_CONFIG["gpt"]["max_retries"])
+        elif self.ai_provider == "claude" and self.anthropic_client:
+            return anthropic.AsyncAnthropic(api_key=self.anthropic_client.api_key, max_retries=AI_CONFIG["claude"]["max_retries"])
+        return None
         
-        text = tweet_data.get('text', '')
+    def _prompt_text(self, tweet_data):
+        # The opening of a tweet carries the signal; capping it bounds prompt size and latency
+        return (tweet_data.get('text') or '')[:self._config["max_tweet_chars"]]
+    
+    def _build_tweet_prompt(self, tweet_data, context=None):
+        text = self._prompt_text(tweet_data)
         is_retweet = tweet_data.get('is_retweet', False)
         is_pinned = tweet_data.get('is_pinned', False)
         
-        prompt = f"""Rate this tweet 1-10 for {context}:
-- Announcements, earnings: 9-10
-- Tech updates, news: 7-8  
-- Insights, commentary: 5-6
-- Social, memes: 1-4
-
-Tweet: "{text}"
-Retweet: {is_retweet}
-Pinned: {is_pinned}
-
-JSON: {{"score": X, "reason": "brief explanation"}}"""
+        if context is None:
+            return f"Text: {text}\nRT: {is_retweet}\nPinned: {is_pinned}"
+        return f"Context: {context}\nText: {text}\nRT: {is_retweet}\nPinned: {is_pinned}"
+    
+    def _gpt_request(self, tweet_data, context):
+        config = self._gpt_config
+        return {
+            "model": config["model"],
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT_GPT},
+                {"role": "user", "content": self._build_tweet_prompt(tweet_data, context)}
+            ],
+            "max_tokens": config["max_tokens"],
+            "temperature": config["temperature"],
+            "tools": [RATE_TOOL],
+            "tool_choice": {"type": "function", "function": {"name": "rate"}}
+        }
+    
+    def _claude_request(self, tweet_data, context):
+        config = self._claude_config
+        return {
+            "model": config["model"],
+            "max_tokens": config["max_tokens"],
+            "system": claude_system(context),
+            "messages": [{"role": "user", "content": self._build_tweet_prompt(tweet_data)}]
+        }
+    
+    def _cache_get(self, provider, request):
+        if self.cache is None:
+            return None, None
+        
+        cache_key = make_cache_key(provider, request)
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return cache_key, cached
+    
+    def _cache_set(self, cache_key, classification):
+        if cache_key is not None:
+            self.cache.set(cache_key, classification)
+    
+    def _semantic_partition(self, tweet_data, context):
+        return self.ai_provider, context, bool(tweet_data.get('is_retweet')), bool(tweet_data.get('is_pinned'))
+    
+    def _semantic_get_many(self, tweets, context):
+        if not tweets:
+            return []
+        if self.semantic_cache is None:
+            return [(None, None)] * len(tweets)
+        
+        matches = self.semantic_cache.lookup_many(
+            [tweet_data.get('text', '') for tweet_data in tweets],
+            [self._semantic_partition(tweet_data, context) for tweet_data in tweets]
+        )
+        self.stats["semantic_hits"] += sum(1 for _, similar in matches if similar)
+        return matches
+    
+    def _semantic_add(self, embedding, tweet_data, context, classification):
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(embedding, self._semantic_partition(tweet_data, context), classification)
+    
+    def classify_with_gpt(self, tweet_data, context):
+        if not self.openai_client:
+            return 5, "GPT client not available"
+        
+        request = self._gpt_request(tweet_data, context)
+        cache_key, cached = self._cache_get("gpt", request)
+        if cached:
+            return cached
+        embedding, similar = self._semantic_get_many([tweet_data], context)[0]
+        if similar:
+            return similar
         
         try:
-            config = AI_CONFIG["gpt"]
-            response = self.openai_client.chat.completions.create(
-                model=config["model"],
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=config["max_tokens"],
-                temperature=config["temperature"]
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            return result.get('score', 5), result.get('reason', 'GPT classification')
+            with self.openai_client.chat.completions.create(**request, stream=True) as stream:
+                classification = parse_tool_rating(collect_json(tool_arguments(chunk) for chunk in stream))
             
         except Exception as e:
             print(f"GPT classification error: {e}")
+            self._check_fatal(e)
             return 5, f"GPT error: {str(e)[:50]}"
     
+        self._cache_set(cache_key, classification)
+        self._semantic_add(embedding, tweet_data, context, classification)
+        return classification
+    
     def classify_with_claude(self, tweet_data, context):
         if not self.anthropic_client:
             return 5, "Claude client not available"
         
-        text = tweet_data.get('text', '')
-        is_retweet = tweet_data.get('is_retweet', False)
-        is_pinned = tweet_data.get('is_pinned', False)
+        request = self._claude_request(tweet_data, context)
+        cache_key, cached = self._cache_get("claude", request)
+        if cached:
+            return cached
+        embedding, similar = self._semantic_get_many([tweet_data], context)[0]
+        if similar:
+            return similar
         
-        prompt = f"""Rate this tweet 1-10 for {context}:
-- Announcements, earnings: 9-10
-- Tech updates, breakthroughs: 7-8
-- Industry insights: 5-6
-- Social, memes: 1-4
-
-Tweet: "{text}"
-Retweet: {is_retweet}
-Pinned: {is_pinned}
-
-JSON: {{"score": X, "reason": "brief explanation"}}"""
+        try:
+            with self.anthropic_client.messages.stream(**request) as stream:
+                classification = parse_rating(collect_json(stream.text_stream), "Claude")
+        
+        except Exception as e:
+            print(f"Claude classification error: {e}")
+            self._check_fatal(e)
+            return 5, f"Claude error: {str(e)[:50]}"
         
+        self._cache_set(cache_key, classification)
+        self._semantic_add(embedding, tweet_data, context, classification)
+        return classification
+    
+    def _batch_item(self, tweet_data):
+        return {
+            "text": self._prompt_text(tweet_data),
+            "rt": bool(tweet_data.get('is_retweet')),
+            "pinned": bool(tweet_data.get('is_pinned'))
+        }
+    
+    def _batch_cache_request(self, tweet_data, context):
+        # Everything a batch answer depends on apart from the other tweets in the batch;
+        # kept apart from single-tweet request keys since it isn't the same request
+        config = self._config
+        if self.ai_provider == "gpt":
+            system, response_format = SYSTEM_PROMPT_GPT, BATCH_RESPONSE_FORMAT
+        else:
+            system, response_format = claude_system(context), None
+        return {
+            "batch": True,
+            "model": config["model"],
+            "temperature": config.get("temperature"),
+            "system": system,
+            "response_format": response_format,
+            "context": context,
+            "tweet": self._batch_item(tweet_data)
+        }
+    
+    def _build_batch_prompt(self, tweet_batch, context=None):
+        items = [{"id": i, **self._batch_item(tweet_data)} for i, tweet_data in enumerate(tweet_batch, 1)]
+        tweets_json = json.dumps(items, ensure_ascii=False)
+        if context is None:
+            return f"Tweets: {tweets_json}"
+        return f"Context: {context}\nTweets: {tweets_json}"
+    
+    def _parse_batch_results(self, content, count, label):
+        # Tweets the model skipped are left as None so callers can tell them
+        # apart from real classifications (and avoid caching them).
+        # Items without a usable score count as skipped too, so nothing malformed gets cached
+        results = [None] * count
+        for item in json_loads(content).get('results', []):
+            if not isinstance(item, dict):
+                continue
+            i = item.get('id')
+            score = coerce_score(item.get('score'))
+            if isinstance(i, int) and 1 <= i <= count and score is not None:
+                reason = item.get('reason')
+                results[i - 1] = (score, f'{label} classification' if reason is None else str(reason))
+        return results
+    
+    def _request_batch_with_gpt(self, tweet_batch, context):
+        config = self._gpt_config
+        with self.openai_client.chat.completions.create(
+            model=config["model"],
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT_GPT},
+                {"role": "user", "content": self._build_batch_prompt(tweet_batch, context)}
+            ],
+            max_tokens=config["max_tokens"] * len(tweet_batch),
+            temperature=config["temperature"],
+            response_format=BATCH_RESPONSE_FORMAT,
+            stream=True
+        ) as stream:
+            content = collect_json(chunk.choices[0].delta.content for chunk in stream if chunk.choices)
+        return self._parse_batch_results(content, len(tweet_batch), "GPT")
+    
+    def _request_batch_with_claude(self, tweet_batch, context):
+        config = self._claude_config
+        with self.anthropic_client.messages.stream(
+            model=config["model"],
+            max_tokens=config["max_tokens"] * len(tweet_batch),
+            system=claude_system(context),
+            messages=[{"role": "user", "content": self._build_batch_prompt(tweet_batch)}]
+        ) as stream:
+            content = collect_json(stream.text_stream)
+        return self._parse_batch_results(content, len(tweet_batch), "Claude")
+    
+    def _check_fatal(self, error):
+        # A rejected key fails every call the same way, so stop using the provider
+        # and let callers fall back to keywords instead of collecting score-5 errors
+        if isinstance(error, FATAL_API_ERRORS) and self.is_ai_available():
+            print(f"Disabling {PROVIDER_LABELS.get(self.ai_provider, self.ai_provider)} classification: {error}")
+            self.openai_client = None
+            self.anthropic_client = None
+    
+    def _classify_chunk(self, request_fn, tweet_batch, context):
+        label = PROVIDER_LABELS[self.ai_provider]
+        if not self.is_ai_available():
+            return [(5, f"{label} client not available")] * len(tweet_batch), False
         try:
-            config = AI_CONFIG["claude"]
-            response = self.anthropic_client.messages.create(
-                model=config["model"],
-                max_tokens=config["max_tokens"],
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            result = json.loads(response.content[0].text)
-            return result.get('score', 5), result.get('reason', 'Claude classification')
+            with self._request_slots:
+                results = request_fn(tweet_batch, context)
+        except Exception as e:
+            print(f"{label} batch classification error: {e}")
+            self._check_fatal(e)
+            return [(5, f"{label} error: {str(e)[:50]}")] * len(tweet_batch), False
+        return [result or (5, f"{label} batch: missing result") for result in results], True
+    
+    def classify_batch_with_gpt(self, tweet_batch, context):
+        if not self.openai_client:
+            return [(5, "GPT client not available")] * len(tweet_batch)
+        return self._classify_chunk(self._request_batch_with_gpt, tweet_batch, context)[0]
+    
+    def classify_batch_with_claude(self, tweet_batch, context):
+        if not self.anthropic_client:
+            return [(5, "Claude client not available")] * len(tweet_batch)
+        return self._classify_chunk(self._request_batch_with_claude, tweet_batch, context)[0]
+        
+    async def classify_with_gpt_async(self, client, tweet_data, context):
+        request = self._gpt_request(tweet_data, context)
+        cache_key, cached = self._cache_get("gpt", request)
+        if cached:
+            return cached
+        
+        try:
+            stream = await client.chat.completions.create(**request, stream=True)
+            async with stream:
+                content = await collect_json_async(tool_arguments(chunk) async for chunk in stream)
+            classification = parse_tool_rating(content)
+        
+        except Exception as e:
+            print(f"GPT classification error: {e}")
+            self._check_fatal(e)
+            return 5, f"GPT error: {str(e)[:50]}"
+    
+        self._cache_set(cache_key, classification)
+        return classification
+    
+    async def classify_with_claude_async(self, client, tweet_data, context):
+        request = self._claude_request(tweet_data, context)
+        cache_key, cached = self._cache_get("claude", request)
+        if cached:
+            return cached
+        
+        try:
+            async with client.messages.stream(**request) as stream:
+                classification = parse_rating(await collect_json_async(stream.text_stream), "Claude")
             
         except Exception as e:
             print(f"Claude classification error: {e}")
+            self._check_fatal(e)
             return 5, f"Claude error: {str(e)[:50]}"
+        
+        self._cache_set(cache_key, classification)
+        return classification
+    
+    def _classify_unknown(self, tweet_data, context):
+        return 5, "Unknown AI provider"
+    
+    def _keyword_shortcut(self, tweet_data):
+        # Pinned tweets, strong keyword hits and plain retweets don't need an LLM call
+        config = self._config
+        if config is None:
+            return None
+        
+        score, reason = self.simple_keyword_classification(tweet_data)
+        if (tweet_data.get('is_pinned') or score >= config["ai_cutoff_high"]
+                or (score <= config["ai_cutoff_low"] and tweet_data.get('is_retweet'))):
+            # Counted so the cutoffs can be tuned against how much AI traffic they save
+            self.stats["keyword_shortcuts"] += 1
+            return score, reason
+        return None
     
     def classify_tweet(self, tweet_data, context):
+        return self._keyword_shortcut(tweet_data) or self._classify_fn(tweet_data, context)
+    
+    def classify_batch(self, tweets, context):
+        if self.ai_provider == "gpt" and self.openai_client:
+            request_fn = self._request_batch_with_gpt
+        elif self.ai_provider == "claude" and self.anthropic_client:
+            request_fn = self._request_batch_with_claude
+        else:
+            return [self.classify_tweet(tweet_data, context) for tweet_data in tweets]
+        
+        results = [None] * len(tweets)
+        misses = []
+        for i, tweet_data in enumerate(tweets):
+            shortcut = self._keyword_shortcut(tweet_data)
+            if shortcut:
+                results[i] = shortcut
+                continue
+            cache_key, cached = self._cache_get(self.ai_provider, self._batch_cache_request(tweet_data, context))
+            if cached:
+                results[i] = cached
+            else:
+                misses.append((i, cache_key))
+        
+        pending = []
+        matches = self._semantic_get_many([tweets[i] for i, _ in misses], context) if misses else []
+        for (i, cache_key), (embedding, similar) in zip(misses, matches):
+            if similar:
+                results[i] = similar
+            else:
+                pending.append((i, cache_key, embedding))
+        
+        batch_size = self._config["batch_size"]
+        chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+        
+        def classify_chunk(chunk):
+            return self._classify_chunk(request_fn, [tweets[i] for i, _, _ in chunk], context)
+        
+        # Large timelines span several batches; send them concurrently instead of one after another
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(self._config["max_concurrent"], len(chunks))) as executor:
+                outcomes = list(executor.map(classify_chunk, chunks))
+        else:
+            outcomes = [classify_chunk(chunk) for chunk in chunks]
+        
+        for chunk, (classifications, ok) in zip(chunks, outcomes):
+            if not ok and not self.is_ai_available():
+                classifications = [
+                    (score, reason + " (AI not available - using keywords)")
+                    for score, reason in (self.simple_keyword_classification(tweets[i]) for i, _, _ in chunk)
+                ]
+            for (i, cache_key, embedding), classification in zip(chunk, classifications):
+                results[i] = classification
+                if ok:
+                    self._cache_set(cache_key, classification)
+                    self._semantic_add(embedding, tweets[i], context, classification)
+        return results
+    
+    async def classify_tweets_async(self, tweets, context):
+        client = self._create_async_client()
+        if client is None:
+            return [self.classify_tweet(tweet_data, context) for tweet_data in tweets]
+        
+        config = self._config
         if self.ai_provider == "gpt":
-            return self.classify_with_gpt(tweet_data, context)
-        elif self.ai_provider == "claude":
-            return self.classify_with_claude(tweet_data, context)
+            classify_fn, system_prompt = self.classify_with_gpt_async, SYSTEM_PROMPT_GPT
         else:
-            return 5, "Unknown AI provider"
+            classify_fn, system_prompt = self.classify_with_claude_async, SYSTEM_PROMPT_CLAUDE
+        
+        semaphore = asyncio.Semaphore(config["max_concurrent"])
+        limiter = RateLimiter(config["max_requests_per_minute"], config["max_tokens_per_minute"])
+        
+        async def classify_one(tweet_data):
+            shortcut = self._keyword_shortcut(tweet_data)
+            if shortcut:
+                return shortcut
+            # ~4 characters per token, plus the completion budget
+            estimated_tokens = (len(system_prompt) + len(self._build_tweet_prompt(tweet_data, context))) // 4 + config["max_tokens"]
+            async with semaphore:
+                await limiter.acquire(estimated_tokens)
+                return await classify_fn(client, tweet_data, context)
+        
+        async with client:
+            return await asyncio.gather(*(classify_one(tweet_data) for tweet_data in tweets))
+    
+    def classify_tweets(self, tweets, context):
+        if not tweets:
+            return []
+        return asyncio.run(self.classify_tweets_async(tweets, context))
     
     def is_ai_available(self):
-        if self.ai_provider == "gpt":
-            return self.openai_client is not None
-        elif self.ai_provider == "claude":
-            return self.anthropic_client is not None
-        return False
+        return self._is_available_fn()
+    
+    def match_keyword_category(self, text):
+        if self.KEYWORD_AUTOMATON is not None:
+            best_rank = None
+            for _, (rank, _, _) in self.KEYWORD_AUTOMATON.iter(text):
+                if best_rank is None or rank < best_rank:
+                    best_rank = rank
+                    if rank == 0:
+                        break
+            return KEYWORD_CATEGORIES[best_rank] if best_rank is not None else None
+        
+        for category in KEYWORD_CATEGORIES:
+            if KEYWORD_PATTERNS[category].search(text):
+                return category
+        return None
     
     def simple_keyword_classification(self, tweet_data):
-        text = tweet_data.get('text', '').lower()
+        if '_text_lower' not in tweet_data:
+            tweet_data = prepare_tweet(dict(tweet_data))
+        is_retweet = tweet_data['_is_retweet']
+        is_pinned = tweet_data['_is_pinned']
         score = 5
+        category = None if is_pinned else self.match_keyword_category(tweet_data['_text_lower'])
         
-        if tweet_data.get('is_pinned'):
+        if is_pinned:
             score = 9
             reason = "Pinned tweet"
-        elif any(keyword in text for keyword in KEYWORD_CONFIG["high_priority"]):
+        elif category == "high_priority":
             score = 8
             reason = "High priority keyword"
-        elif any(keyword in text for keyword in KEYWORD_CONFIG["company_keywords"]):
-            score = 7 if not tweet_data.get('is_retweet') else 5
+        elif category == "company_keywords":
+            score = 7 if not is_retweet else 5
             reason = "Company keyword"
-        elif any(keyword in text for keyword in KEYWORD_CONFIG["tech_keywords"]):
-            score = 6 if not tweet_data.get('is_retweet') else 4
+        elif category == "tech_keywords":
+            score = 6 if not is_retweet else 4
             reason = "Tech keyword"
-        elif tweet_data.get('is_retweet'):
+        elif is_retweet:
             score = 4
             reason = "Retweet"
         else:
             reason = "Default classification"
         
-        return score, reason
\ No newline at end of file
+        return score, reason
+    
+    def _batch_keyword_ranks(self, texts):
+        # Scan every tweet in one pass over a NUL-joined buffer; keywords never
+        # contain NUL, so a match can't span two tweets.
+        joined = "\0".join(texts)
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        
+        ranks = [None] * len(texts)
+        if self.KEYWORD_AUTOMATON is not None:
+            for end, (rank, _, keyword) in self.KEYWORD_AUTOMATON.iter(joined):
+                i = bisect.bisect_right(starts, end - len(keyword) + 1) - 1
+                if ranks[i] is None or rank < ranks[i]:
+                    ranks[i] = rank
+            return ranks
+        
+        for rank in reversed(range(len(KEYWORD_CATEGORIES))):
+            for match in KEYWORD_PATTERNS[KEYWORD_CATEGORIES[rank]].finditer(joined):
+                ranks[bisect.bisect_right(starts, match.start()) - 1] = rank
+        return ranks
+    
+    def classify_batch_keyword(self, tweets):
+        prepared = [tweet_data if '_text_lower' in tweet_data else prepare_tweet(dict(tweet_data)) for tweet_data in tweets]
+        ranks = self._batch_keyword_ranks([tweet_data['_text_lower'] for tweet_data in prepared])
+        
+        results = []
+        for tweet_data, rank in zip(prepared, ranks):
+            is_retweet = tweet_data['_is_retweet']
+            if tweet_data['_is_pinned']:
+                results.append((9, "Pinned tweet"))
+            elif rank == 0:
+                results.append((8, "High priority keyword"))
+            elif rank == 1:
+                results.append((5 if is_retweet else 7, "Company keyword"))
+            elif rank == 2:
+                results.append((4 if is_retweet else 6, "Tech keyword"))
+            elif is_retweet:
+                results.append((4, "Retweet"))
+            else:
+                results.append((5, "Default classification"))
+        return results
\ No newline at end of file
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Protocol
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+
+json_loads = orjson.loads if orjson else json.loads
+
+
+def json_dumps(value):
+    if orjson:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, ensure_ascii=False)
+
+
+def canonical_json(value):
+    # Both branches produce the same bytes, so cache keys survive orjson being installed or removed
+    if orjson:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def make_cache_key(provider, request):
+    return hashlib.sha256(canonical_json({"provider": provider, "request": request})).hexdigest()
+
+
+class CacheBackend(Protocol):
+    
+    def get(self, key):
+        ...
+    
+    def set(self, key, value, ttl=None):
+        ...
+
+
+class DiskCache:
+    
+    # Expired rows are purged on open and then once per this many writes
+    PURGE_EVERY = 1000
+    
+    def __init__(self, path="classifier_cache.db", ttl=86400):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS classifications "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS classifications_expires_at ON classifications (expires_at)")
+        with self._lock:
+            self._purge_expired()
+    
+    def _purge_expired(self):
+        # Changed prompts or contexts make new keys, so stale rows would otherwise pile up
+        self._conn.execute("DELETE FROM classifications WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+    
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM classifications WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return tuple(json_loads(value))
+    
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO classifications (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json_dumps(list(value)), expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._purge_expired()
+            else:
+                self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisCache:
+    
+    def __init__(self, url=None, ttl=86400, prefix="tweet_classifier:"):
+        if not redis:
+            raise ImportError("RedisCache requires the 'redis' package")
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url or os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+    
+    def get(self, key):
+        value = self._client.get(self.prefix + key)
+        if value is None:
+            return None
+        return tuple(json_loads(value))
+    
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self._client.set(self.prefix + key, json_dumps(list(value)), ex=ttl or None)
+
+
+class SemanticCache:
+    
+    def __init__(self, embed_fn, threshold=0.92, max_entries=10000):
+        if np is None:
+            raise ImportError("SemanticCache requires the 'numpy' package")
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._partitions = {}
+        self._lock = threading.Lock()
+    
+    def _embed_many(self, texts):
+        # Blank texts aren't sent: a single empty string makes the API reject the whole request
+        embeddings = [None] * len(texts)
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indices:
+            return embeddings
+        try:
+            vectors = np.asarray(self.embed_fn([texts[i] for i in indices]), dtype=np.float32)
+            if vectors.ndim != 2 or len(vectors) != len(indices):
+                raise ValueError(f"expected {len(indices)} embeddings, got shape {vectors.shape}")
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        except Exception as e:
+            print(f"Warning: Embedding request failed, skipping semantic cache: {e}")
+            return embeddings
+        norms[norms == 0] = 1
+        for i, vector in zip(indices, vectors / norms):
+            embeddings[i] = vector
+        return embeddings
+    
+    def lookup_many(self, texts, partitions):
+        if not texts:
+            return []
+        embeddings = self._embed_many(texts)
+        results = []
+        with self._lock:
+            for embedding, partition in zip(embeddings, partitions):
+                entry = self._partitions.get(partition)
+                if embedding is None or entry is None or entry["count"] == 0:
+                    results.append((embedding, None))
+                    continue
+                
+                size = min(entry["count"], self.max_entries)
+                similarities = entry["matrix"][:size] @ embedding
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    results.append((embedding, entry["results"][best]))
+                else:
+                    results.append((embedding, None))
+        return results
+    
+    def lookup(self, text, partition):
+        return self.lookup_many([text], [partition])[0]
+    
+    def add(self, embedding, partition, classification):
+        if embedding is None:
+            return
+        
+        with self._lock:
+            entry = self._partitions.get(partition)
+            if entry is None:
+                entry = {
+                    "matrix": np.empty((min(64, self.max_entries), embedding.shape[0]), dtype=np.float32),
+                    "results": [],
+                    "count": 0
+                }
+                self._partitions[partition] = entry
+            
+            # Oldest entries are overwritten once max_entries is reached
+            slot = entry["count"] % self.max_entries
+            if slot >= entry["matrix"].shape[0]:
+                grown = np.empty((min(entry["matrix"].shape[0] * 2, self.max_entries), embedding.shape[0]), dtype=np.float32)
+                grown[:entry["matrix"].shape[0]] = entry["matrix"]
+                entry["matrix"] = grown
+            
+            entry["matrix"][slot] = embedding
+            if slot < len(entry["results"]):
+                entry["results"][slot] = tuple(classification)
+            else:
+                entry["results"].append(tuple(classification))
+            entry["count"] += 1
+
+
+def create_cache(config):
+    if not config.get("enabled"):
+        return None
+    
+    backend = config.get("backend", "disk")
+    try:
+        if backend == "disk":
+            return DiskCache(config.get("path", "classifier_cache.db"), config.get("ttl_seconds", 86400))
+        elif backend == "redis":
+            return RedisCache(config.get("redis_url"), config.get("ttl_seconds", 86400))
+    except Exception as e:
+        print(f"Warning: Could not initialize {backend} classification cache: {e}")
+        return None
+    
+    print(f"Warning: Unknown classification cache backend '{backend}'")
+    return None
+
+
+def create_semantic_cache(config):
+    if not config.get("enabled"):
+        return None
+    
+    api_key = os.getenv('OPENAI_API_KEY')
+    if np is None or openai is None or not api_key:
+        print("Warning: Semantic cache needs numpy, openai and OPENAI_API_KEY; disabling it")
+        return None
+    
+    client = openai.OpenAI(api_key=api_key)
+    model = config.get("model", "text-embedding-3-small")
+    
+    def embed(texts):
+        response = client.embeddings.create(model=model, input=texts)
+        return [item.embedding for item in response.data]
+    
+    return SemanticCache(embed, config.get("threshold", 0.92), config.get("max_entries", 10000))
\ No newline at end of file
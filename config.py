@@ -53,25 +53,66 @@ HANDLES_CONFIG = {
 AI_CONFIG = {
     "gpt": {
         "model": "gpt-4o-mini",
-        "max_tokens": 100,
-        "temperature": 0.3
+        "max_tokens": 60,
+        "temperature": 0,
+        "batch_size": 50,
+        "max_retries": 3,
+        "max_concurrent": 10,
+        "max_requests_per_minute": 500,
+        "max_tokens_per_minute": 200000,
+        "max_tweet_chars": 500,
+        "ai_cutoff_low": 4,
+        "ai_cutoff_high": 8
     },
     "claude": {
         "model": "claude-3-5-haiku-20241022",
-        "max_tokens": 100
+        "max_tokens": 100,
+        "batch_size": 50,
+        "max_retries": 3,
+        "max_concurrent": 5,
+        "max_requests_per_minute": 50,
+        "max_tokens_per_minute": 50000,
+        "max_tweet_chars": 500,
+        "ai_cutoff_low": 4,
+        "ai_cutoff_high": 8
     }
 }
 SCRAPER_CONFIG = {
     "base_url": "http://127.0.0.1:8080",
+    "seen_tweets_db": "seen_tweets.db",
+    # Legacy JSON store, imported into seen_tweets_db the first time it is empty
     "seen_tweets_file": "seen_tweets.json",
+    "max_seen_tweets": 200000,
+    "stop_after_seen": 10,
+    # Items read per timeline page; 0 reads the whole page
+    "max_timeline_items": 0,
     "output_file": "tweets_multi_handle.json",
+    "max_workers": 16,
+    # Retries for timeline requests on connection errors and 429/502/503/504, with exponential backoff
+    "max_retries": 3,
+    "retry_backoff": 0.3,
     "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
+CACHE_CONFIG = {
+    "enabled": True,
+    "backend": "disk",
+    "path": "classifier_cache.db",
+    "redis_url": None,
+    "ttl_seconds": 86400,
+    "semantic": {
+        "enabled": False,
+        "model": "text-embedding-3-small",
+        "threshold": 0.92,
+        "max_entries": 10000
+    }
+}
 EMAIL_CONFIG = {
     "enabled": False,
     "min_score_for_email": 8,
     "send_batch_summary": True,
-    "send_individual_alerts": True
+    "send_individual_alerts": True,
+    # Parallel SMTP sessions for bulk sends; keep low for Gmail
+    "max_workers": 4
 }
 KEYWORD_CONFIG = {
     "high_priority": [
@@ -2,10 +2,13 @@
 
 import smtplib
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from dotenv import load_dotenv
+from config import EMAIL_CONFIG
 
 load_dotenv()
 
@@ -27,6 +30,84 @@ class EmailNotifier:
         
         if not self.is_configured:
             print("⚠️ Email notifications not configured. Set EMAIL_USER, EMAIL_PASSWORD, RECIPIENT_EMAIL environment variables.")
+        
+        # Each sending thread keeps its own session; all of them are closed together
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        self.close()
+    
+    def _get_smtp(self):
+        # One authenticated session is reused so TLS and AUTH are paid once per run
+        server = getattr(self._local, 'smtp', None)
+        if server is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            try:
+                server.starttls()
+                server.login(self.email_user, self.email_password)
+            except Exception:
+                server.close()
+                raise
+            self._local.smtp = server
+            with self._sessions_lock:
+                self._sessions.append(server)
+        return server
+    
+    def _drop_smtp(self):
+        server, self._local.smtp = getattr(self._local, 'smtp', None), None
+        if server is not None:
+            with self._sessions_lock:
+                if server in self._sessions:
+                    self._sessions.remove(server)
+            self._close_session(server)
+    
+    @staticmethod
+    def _close_session(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def _send_message(self, msg):
+        # Sending and reconnecting on failure is cheaper than a NOOP probe before every message
+        try:
+            self._get_smtp().send_message(msg)
+            return
+        except smtplib.SMTPResponseException as e:
+            # 421 is the server closing an idle session; anything else refuses just this
+            # message and leaves the session usable
+            if e.smtp_code != 421:
+                raise
+            self._drop_smtp()
+        except smtplib.SMTPServerDisconnected:
+            self._drop_smtp()
+        except Exception:
+            self._drop_smtp()
+            raise
+        
+        try:
+            self._get_smtp().send_message(msg)
+        except Exception:
+            self._drop_smtp()
+            raise
+    
+    def close(self):
+        lock = getattr(self, '_sessions_lock', None)
+        if lock is None:
+            return
+        with lock:
+            sessions, self._sessions = self._sessions, []
+        for server in sessions:
+            self._close_session(server)
+        self._local = threading.local()
     
     def send_tweet_notification(self, tweet, handle):
         if not self.is_configured:
@@ -45,10 +126,7 @@ class EmailNotifier:
             body = self._create_tweet_email_body(tweet, handle)
             msg.attach(MIMEText(body, 'plain'))
             
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email_user, self.email_password)
-                server.send_message(msg)
+            self._send_message(msg)
             
             print(f"📧 Email sent for tweet from @{handle} (Score: {score})")
             return True
@@ -57,6 +135,40 @@ class EmailNotifier:
             print(f"❌ Failed to send email: {e}")
             return False
     
+    def send_notifications_bulk(self, tweet_handle_pairs, max_workers=None):
+        if not self.is_configured or not tweet_handle_pairs:
+            return 0
+        
+        max_workers = max_workers or EMAIL_CONFIG.get("max_workers", 4)
+        # Pool threads die with the executor, so the sessions they opened are closed here
+        opened = set()
+        
+        def send(pair):
+            try:
+                return self.send_tweet_notification(*pair)
+            finally:
+                server = getattr(self._local, 'smtp', None)
+                if server is not None:
+                    opened.add(server)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(tweet_handle_pairs))) as executor:
+                return sum(1 for ok in executor.map(send, tweet_handle_pairs) if ok)
+        finally:
+            with self._sessions_lock:
+                self._sessions = [server for server in self._sessions if server not in opened]
+            for server in opened:
+                self._close_session(server)
+    
+    def send_digest(self, tweets):
+        # One message for every tweet at or above the email threshold
+        tweets_by_handle = {}
+        for tweet in tweets:
+            if tweet.get('importance_score', 0) >= self.min_score_for_email:
+                tweets_by_handle.setdefault(tweet.get('handle', 'unknown'), []).append(tweet)
+        total = sum(len(handle_tweets) for handle_tweets in tweets_by_handle.values())
+        return self.send_batch_notification(tweets_by_handle, total)
+    
     def send_batch_notification(self, tweets_by_handle, total_important):
         if not self.is_configured or total_important == 0:
             return False
@@ -70,10 +182,7 @@ class EmailNotifier:
             body = self._create_batch_email_body(tweets_by_handle, total_important)
             msg.attach(MIMEText(body, 'plain'))
             
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email_user, self.email_password)
-                server.send_message(msg)
+            self._send_message(msg)
             
             print(f"📧 Batch email sent for {total_important} important tweets")
             return True
@@ -91,7 +200,7 @@ class EmailNotifier:
         text = tweet.get('text', 'No text available')
         tweet_url = tweet.get('tweet_url', '')
         
-        body = f"""🚨 IMPORTANT TWEET ALERT 🚨
+        parts = [f"""🚨 IMPORTANT TWEET ALERT 🚨
 
 Handle: @{handle}
 Author: {author} ({username})
@@ -103,53 +212,54 @@ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 Tweet Content:
 {text}
 
-"""
+"""]
         if tweet.get('quoted_tweet'):
             quoted = tweet['quoted_tweet']
-            body += f"""
+            parts.append(f"""
 Quoted Tweet:
 From: {quoted.get('author', 'Unknown')} ({quoted.get('username', 'Unknown')})
 "{quoted.get('text', 'No text')}"
-"""
+""")
         if tweet.get('media'):
             media_count = len(tweet['media'])
             media_types = [m.get('type', 'unknown') for m in tweet['media']]
-            body += f"\nMedia: {media_count} attachments ({', '.join(set(media_types))})"
+            parts.append(f"\nMedia: {media_count} attachments ({', '.join(set(media_types))})")
         stats = tweet.get('stats', {})
         if any(stats.values()):
-            body += f"""
+            parts.append(f"""
 Engagement:
 - Likes: {stats.get('likes', 'N/A')}
 - Retweets: {stats.get('retweets', 'N/A')}
 - Replies: {stats.get('replies', 'N/A')}
-"""
+""")
         
-        body += f"""
+        parts.append(f"""
 --
 AI Twitter Scraper
 Powered by {tweet.get('ai_provider', 'keyword')} classification
-"""
+""")
         
-        return body
+        return "".join(parts)
     
     def _create_batch_email_body(self, tweets_by_handle, total_important):
-        body = f"""📊 TWITTER DIGEST REPORT
+        parts = [f"""📊 TWITTER DIGEST REPORT
 
 Total Important Tweets: {total_important}
 Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
-"""
+"""]
+        separator = '='*50
         
         for handle, tweets in tweets_by_handle.items():
             if not tweets:
                 continue
                 
-            body += f"""
-                    {'='*50}
+            parts.append(f"""
+                    {separator}
                     @{handle.upper()} ({len(tweets)} important tweets)
-                    {'='*50}
+                    {separator}
 
-                    """
+                    """)
             sorted_tweets = sorted(tweets, key=lambda x: x.get('importance_score', 0), reverse=True)
             
             for i, tweet in enumerate(sorted_tweets):
@@ -160,22 +270,22 @@ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 text = tweet.get('text', 'No text available')
                 urls = tweet.get('urls', [])
                 
-                body += f"""
+                parts.append(f"""
                     {i+1}. [{score}/10] {reason}
                     Author: {author}
                     Date: {date}
                     Text: {text[:1000]}{'...' if len(text) > 1000 else ''}
-                    """
+                    """)
                 if urls:
-                    body += f"URLs: {', '.join(urls)}\n"
+                    parts.append(f"URLs: {', '.join(urls)}\n")
         
-        body += """
+        parts.append("""
                 --
                 AI Twitter Scraper - Batch Notification
                 Configure notification settings in email_notifier.py
-                """
+                """)
         
-        return body
+        return "".join(parts)
     
     def test_email_connection(self):
         if not self.is_configured:
@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from itertools import takewhile
+
 from tweet_scraper import TwitterScraper
 from config import HANDLES_CONFIG
 from email_notifier import EmailNotifier
@@ -5,28 +8,35 @@ from email_notifier import EmailNotifier
 
 def main():
     notifier = EmailNotifier()
-    if notifier.is_configured and notifier.test_email_connection():
-        email_enabled = True
-    else:
-        email_enabled = False
+    # The SMTP probe runs alongside scraping instead of delaying it
+    executor = ThreadPoolExecutor(max_workers=1)
+    probe = executor.submit(notifier.test_email_connection) if notifier.is_configured else None
+    executor.shutdown(wait=False)
     
     scraper = TwitterScraper(
         ai_classification=True,
         ai_provider="gpt",
         handles_config=HANDLES_CONFIG,
-        enable_email_notifications=email_enabled,
         email_min_score=8
     )
     
     data = scraper.extract_tweets_from_multiple_handles()
     
+    try:
+        email_enabled = bool(probe and probe.result(timeout=5))
+    except TimeoutError:
+        print("⚠️ Email probe timed out; skipping notifications")
+        email_enabled = False
+    
     if data and data['stats']['total_important_tweets'] > 0:
         scraper.save_tweets(data)
         scraper.print_results_summary(data)
         
         if email_enabled:
-            high_priority = len([t for t in data['combined_tweets'] if t.get('importance_score', 0) >= 8])
-            print(f"\n📧 Sent {high_priority} email notifications")
+            # combined_tweets is sorted by score, so the high-priority tweets are a prefix
+            high_priority = list(takewhile(lambda t: t.get('importance_score', 0) >= notifier.min_score_for_email, data['combined_tweets']))
+            if high_priority and notifier.send_digest(high_priority):
+                print(f"\n📧 Sent digest with {len(high_priority)} high-priority tweets")
     else:
         print("No important tweets found!")
 
@@ -46,5 +56,22 @@ def scrape_handle(handle, min_score=6):
     return result
 
 
+def compare_ai_providers(handles=None, providers=("gpt", "claude")):
+    # Pages are fetched once and every provider scores the same tweets
+    scrapers = {
+        provider: TwitterScraper(ai_classification=True, ai_provider=provider, handles_config=HANDLES_CONFIG)
+        for provider in providers
+    }
+    timelines = scrapers[providers[0]].fetch_timelines(handles)
+    
+    results = {}
+    for provider, scraper in scrapers.items():
+        results[provider] = scraper.classify_timelines(timelines)
+        stats = results[provider]['stats']
+        print(f"\n🤖 {provider.upper()}: {stats['total_important_tweets']} important, {stats['total_filtered_tweets']} filtered")
+    
+    return results
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
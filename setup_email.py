@@ -1,16 +1,37 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
+import sys
 import getpass
-from email_notifier import EmailNotifier, setup_gmail_instructions
 
+# email_notifier (smtplib, email, dotenv) is imported inside the functions that send,
+# so printing the menu doesn't pay for it
 
-def setup_email_config():
-    """Interactive setup for email notifications"""
+
+PROVIDER_CHOICES = {'gmail': '1', 'outlook': '2', 'yahoo': '3', 'other': '4'}
+
+
+def read_password(prompt, from_stdin=False):
+    """Read a password from the terminal, or as one line from stdin when it is piped"""
+    # getpass reads through the tty and can hang on very long pasted input
+    if from_stdin or not sys.stdin.isatty():
+        return sys.stdin.readline().rstrip('\r\n')
+    return getpass.getpass(prompt)
+
+
+def setup_email_config(args=None):
+    """Setup for email notifications; prompts for anything not given on the command line"""
+    from email_notifier import EmailNotifier, setup_gmail_instructions
+    
+    args = args or argparse.Namespace()
+    # With --email the run is scripted: nothing optional is prompted for
+    scripted = getattr(args, 'email', None) is not None
+    
     print("📧 TWITTER SCRAPER EMAIL SETUP")
     print("="*50)
     
-    if os.getenv('EMAIL_USER') and os.getenv('EMAIL_PASSWORD') and os.getenv('RECIPIENT_EMAIL'):
+    if not scripted and os.getenv('EMAIL_USER') and os.getenv('EMAIL_PASSWORD') and os.getenv('RECIPIENT_EMAIL'):
         print("✅ Email already configured!")
         print(f"From: {os.getenv('EMAIL_USER')}")
         print(f"To: {os.getenv('RECIPIENT_EMAIL')}")
@@ -24,13 +45,17 @@ def setup_email_config():
     print("Setting up email notifications for important tweets...")
     print()
     
-    print("Choose your email provider:")
-    print("1. Gmail (recommended)")
-    print("2. Outlook/Hotmail")
-    print("3. Yahoo Mail")
-    print("4. Other")
+    choice = PROVIDER_CHOICES.get(getattr(args, 'provider', None))
+    if choice is None and scripted:
+        choice = '1'  # Gmail
+    if choice is None:
+        print("Choose your email provider:")
+        print("1. Gmail (recommended)")
+        print("2. Outlook/Hotmail")
+        print("3. Yahoo Mail")
+        print("4. Other")
     
-    choice = input("Enter choice (1-4): ").strip()
+        choice = input("Enter choice (1-4): ").strip()
     
     smtp_configs = {
         '1': ('smtp.gmail.com', 587),
@@ -40,27 +65,41 @@ def setup_email_config():
     }
     
     smtp_server, smtp_port = smtp_configs.get(choice, ('smtp.gmail.com', 587))
+    smtp_server = getattr(args, 'smtp_server', None) or smtp_server
+    smtp_port = getattr(args, 'smtp_port', None) or smtp_port
     
     if choice == '4':
-        smtp_server = input("Enter SMTP server: ").strip()
-        smtp_port = int(input("Enter SMTP port (587): ").strip() or "587")
+        if not smtp_server:
+            smtp_server = input("Enter SMTP server: ").strip()
+        if getattr(args, 'smtp_port', None) is None and not scripted:
+            smtp_port = int(input("Enter SMTP port (587): ").strip() or "587")
     
     print("\nEmail Configuration:")
-    email_user = input("Your email address: ").strip()
+    email_user = args.email if scripted else input("Your email address: ").strip()
     
-    if choice == '1':  # Gmail
-        print("\n⚠️  IMPORTANT: For Gmail, you need an 'App Password', not your regular password!")
-        print("   1. Enable 2-factor authentication on your Google account")
-        print("   2. Go to https://myaccount.google.com/apppasswords")
-        print("   3. Generate an app password for 'Mail'")
-        print("   4. Use that 16-character password below")
-        print()
+    password_stdin = getattr(args, 'password_stdin', False)
+    if scripted and not password_stdin and os.getenv('EMAIL_PASSWORD'):
+        email_password = os.getenv('EMAIL_PASSWORD')
+    else:
+        if choice == '1' and not password_stdin:  # Gmail
+            print("\n⚠️  IMPORTANT: For Gmail, you need an 'App Password', not your regular password!")
+            print("   1. Enable 2-factor authentication on your Google account")
+            print("   2. Go to https://myaccount.google.com/apppasswords")
+            print("   3. Generate an app password for 'Mail'")
+            print("   4. Use that 16-character password below")
+            print()
     
-    email_password = getpass.getpass("Email password (or app password): ")
-    recipient_email = input("Send notifications to (email): ").strip() or email_user
+        email_password = read_password("Email password (or app password): ", password_stdin)
+    
+    recipient_email = getattr(args, 'recipient', None)
+    if not recipient_email:
+        recipient_email = email_user if scripted else input("Send notifications to (email): ").strip() or email_user
     
     print("\nNotification Settings:")
-    min_score = input("Minimum importance score for email (8): ").strip() or "8"
+    min_score = getattr(args, 'min_score', None)
+    if min_score is None:
+        min_score = "8" if scripted else input("Minimum importance score for email (8): ").strip() or "8"
+    min_score = str(min_score)
     
     env_vars = f"""
 # Add these to your shell profile (.bashrc, .zshrc, etc.)
@@ -92,8 +131,10 @@ export EMAIL_MIN_SCORE="{min_score}"
     if notifier.test_email_connection():
         print("\n✅ Email configuration successful!")
         
-        send_test = input("Send test notification? (y/n): ").lower().strip()
-        if send_test == 'y':
+        send_test = getattr(args, 'send_test', None)
+        if send_test is None and not scripted:
+            send_test = input("Send test notification? (y/n): ").lower().strip() == 'y'
+        if send_test:
             test_tweet = {
                 'importance_score': 9,
                 'importance_reason': 'Test notification',
@@ -129,8 +170,10 @@ export EMAIL_MIN_SCORE="{min_score}"
             setup_gmail_instructions()
 
 
-def test_current_config():
+def test_current_config(args=None):
     """Test current email configuration"""
+    from email_notifier import EmailNotifier
+    
     print("🧪 Testing current email configuration...")
     
     notifier = EmailNotifier()
@@ -154,10 +197,53 @@ def test_current_config():
         print("❌ Email configuration is not working")
 
 
+def show_gmail_instructions(args=None):
+    """Print the Gmail app password steps"""
+    from email_notifier import setup_gmail_instructions
+    setup_gmail_instructions()
+
+
+MENU_ACTIONS = {
+    '1': setup_email_config,
+    '2': test_current_config,
+    '3': show_gmail_instructions
+}
+
+COMMANDS = {
+    'setup': setup_email_config,
+    'test': test_current_config,
+    'gmail-info': show_gmail_instructions
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Configure email notifications for the Twitter scraper")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    setup = subparsers.add_parser('setup', help="Configure and test SMTP settings")
+    setup.add_argument('--provider', choices=list(PROVIDER_CHOICES), help="Email provider preset")
+    setup.add_argument('--email', help="Sender address; makes the run non-interactive (password from EMAIL_PASSWORD or a prompt)")
+    setup.add_argument('--password-stdin', action='store_true', help="Read the password as one line from stdin")
+    setup.add_argument('--smtp-server', help="SMTP server, overriding the provider preset")
+    setup.add_argument('--smtp-port', type=int, help="SMTP port (default 587)")
+    setup.add_argument('--recipient', help="Where notifications are sent (default: the sender)")
+    setup.add_argument('--min-score', type=int, help="Minimum importance score for email (default 8)")
+    setup.add_argument('--send-test', action=argparse.BooleanOptionalAction, default=None,
+                       help="Send a test notification after the connection check")
+    
+    subparsers.add_parser('test', help="Test the current configuration")
+    subparsers.add_parser('gmail-info', help="Show Gmail app password instructions")
+    return parser
+
+
 def main():
     """Main setup menu"""
-    if len(os.sys.argv) > 1 and os.sys.argv[1] == 'test':
-        test_current_config()
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.command == 'setup' and args.provider == 'other' and not args.smtp_server:
+        parser.error("--provider other requires --smtp-server")
+    if args.command:
+        COMMANDS[args.command](args)
         return
     
     print("📧 Twitter Scraper Email Setup")
@@ -167,12 +253,9 @@ def main():
     
     choice = input("\nChoose option (1-3): ").strip()
     
-    if choice == '1':
-        setup_email_config()
-    elif choice == '2':
-        test_current_config()
-    elif choice == '3':
-        setup_gmail_instructions()
+    action = MENU_ACTIONS.get(choice)
+    if action:
+        action()
     else:
         print("Invalid choice")
 
@@ -0,0 +1,73 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import email_notifier
+import setup_email
+
+
+class FakeSMTP:
+    logins = []
+    
+    def __init__(self, server, port):
+        self.server, self.port = server, port
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def starttls(self):
+        pass
+    
+    def login(self, user, password):
+        FakeSMTP.logins.append((self.server, self.port, user, password))
+
+
+class ScriptedSetupTest(unittest.TestCase):
+    
+    def setUp(self):
+        FakeSMTP.logins = []
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        env = {key: value for key, value in os.environ.items()
+               if key not in ('EMAIL_USER', 'EMAIL_PASSWORD', 'RECIPIENT_EMAIL', 'SMTP_SERVER', 'SMTP_PORT')}
+        patches = [
+            mock.patch.dict(os.environ, env, clear=True),
+            mock.patch.object(email_notifier.smtplib, 'SMTP', FakeSMTP),
+            mock.patch('builtins.input', side_effect=AssertionError("scripted setup prompted")),
+            mock.patch('sys.stdout', io.StringIO())
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+    
+    def test_password_piped_on_stdin_without_provider(self):
+        args = setup_email.build_parser().parse_args(['setup', '--email', 'a@b.com', '--password-stdin'])
+        with mock.patch('sys.stdin', io.StringIO("pw\n")):
+            setup_email.setup_email_config(args)
+        
+        self.assertEqual(FakeSMTP.logins, [('smtp.gmail.com', 587, 'a@b.com', 'pw')])
+        with open('.env_email') as f:
+            self.assertIn('export EMAIL_PASSWORD="pw"', f.read())
+    
+    def test_other_provider_requires_smtp_server(self):
+        with mock.patch.object(sys, 'argv', ['setup_email.py', 'setup', '--provider', 'other', '--email', 'a@b.com']), \
+                mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                setup_email.main()
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,16 +1,124 @@
 #!/usr/bin/env python3
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+import atexit
+import importlib.util
 import json
 import time
 import re
+import heapq
 import os
+import sqlite3
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from classifier import TweetClassifier
-from config import SCRAPER_CONFIG, HANDLES_CONFIG
+from classifier import TweetClassifier, prepare_tweet, strip_prepared
+from classifier_cache import create_cache, create_semantic_cache, json_loads
+from config import SCRAPER_CONFIG, HANDLES_CONFIG, CACHE_CONFIG
 from email_notifier import EmailNotifier
 
+# lxml's C parser is much faster than html.parser; fall back if it isn't installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+STATUS_RE = re.compile(r'/status/(\d+)')
+# The lookahead keeps an ID split across two chunks from matching early
+TWEET_LINK_RE = re.compile(rb'<a[^>]*class="tweet-link"[^>]*href="[^"]*/status/(\d+)(?=\D)')
+NUMBER_RE = re.compile(r'[\d,]+')
+ICON_TO_STAT = {
+    'icon-comment': 'replies',
+    'icon-retweet': 'retweets',
+    'icon-quote': 'quotes',
+    'icon-heart': 'likes',
+    'icon-play': 'views'
+}
+# class -> tag name of the elements pulled out of each timeline item / tweet header
+ITEM_PARTS = {
+    'tweet-link': 'a',
+    'retweet-header': 'div',
+    'pinned': 'div',
+    'tweet-header': 'div',
+    'tweet-content': 'div',
+    'quote': 'div',
+    'attachments': 'div'
+}
+# Classes where every match is kept, not just the first
+ITEM_LISTS = {'tweet-stat': 'span'}
+HEADER_PARTS = {'fullname': 'a', 'username': 'a', 'tweet-date': 'span'}
+QUOTE_PARTS = {'tweet-name-row': 'div', 'quote-text': 'div', 'quote-link': 'a'}
+# Matched as a pattern because the strainer sees the raw class string ("timeline-item ")
+TIMELINE_ONLY = SoupStrainer('div', class_=re.compile(r'(^|\s)timeline-item(\s|$)'))
+
+
+def find_parts(element, parts, lists=None):
+    # One walk over the subtree, keeping the first match per class like find() would,
+    # and every match for the classes in lists like find_all() would
+    found = {}
+    collected = {cls: [] for cls in lists} if lists else None
+    for node in element.descendants:
+        if not isinstance(node, Tag):
+            continue
+        for cls in node.get('class', ()):
+            if parts.get(cls) == node.name and cls not in found:
+                found[cls] = node
+            if collected is not None and lists.get(cls) == node.name:
+                collected[cls].append(node)
+        if collected is None and len(found) == len(parts):
+            break
+    if collected:
+        found.update(collected)
+    return found
+
+
+def write_json(filename, data):
+    # Written to a temp file and renamed over the target, so readers never see a partial file
+    tmp_path = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            if orjson:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                f.write(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def element_text(element, separator=''):
+    # Same result as get_text(separator, strip=True), without bs4's generic string filtering
+    contents = element.contents
+    if len(contents) == 1 and type(contents[0]) is NavigableString:
+        # Names, handles and headers are usually a single text node
+        return contents[0].strip()
+    parts = []
+    for node in element.descendants:
+        if type(node) is NavigableString:
+            text = node.strip()
+            if text:
+                parts.append(text)
+    return separator.join(parts)
+
+
+# Scrapers whose buffered seen IDs are flushed at exit; weak so it doesn't keep them alive
+_OPEN_SCRAPERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_scrapers():
+    for scraper in list(_OPEN_SCRAPERS):
+        scraper.save_seen_tweets()
+
 
 class TwitterScraper:
     
@@ -19,129 +127,260 @@ class TwitterScraper:
         self.ai_classification = ai_classification
         self.ai_provider = ai_provider
         self.handles_config = handles_config or HANDLES_CONFIG
+        # Built once so every request for a handle carries byte-identical context,
+        # which is what the providers' prompt caches key on
+        self._settings = {handle: self._build_settings(handle, config) for handle, config in self.handles_config.items()}
         
-        self.classifier = TweetClassifier(ai_provider)
+        cache = create_cache(CACHE_CONFIG) if ai_classification else None
+        semantic_cache = create_semantic_cache(CACHE_CONFIG["semantic"]) if ai_classification else None
+        self.classifier = TweetClassifier(ai_provider, cache=cache, semantic_cache=semantic_cache)
         self.email_notifier = None
         self.enable_email_notifications = enable_email_notifications
         if enable_email_notifications:
             self.email_notifier = EmailNotifier(min_score_for_email=email_min_score)
         self.seen_tweets_file = SCRAPER_CONFIG["seen_tweets_file"]
-        self.seen_tweet_ids = self.load_seen_tweets()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': SCRAPER_CONFIG["user_agent"]
-        })
+        self.seen_tweets_db = SCRAPER_CONFIG.get("seen_tweets_db", "seen_tweets.db")
+        self._seen_lock = threading.Lock()
+        self._seen_conn = self.load_seen_tweets()
+        # IDs seen since the last save, written to sqlite in one batch by save_seen_tweets
+        self._pending_seen = {}
+        # handle -> (etag, last_modified) from the latest 200, saved alongside the seen IDs
+        self._pending_validators = {}
+        # A run that dies before its final save still keeps what it saw
+        _OPEN_SCRAPERS.add(self)
+        self._local = threading.local()
+        # Shared by every thread's session, so kept-alive connections outlive the worker threads
+        pool_size = SCRAPER_CONFIG.get("max_workers", 16)
+        retries = Retry(total=SCRAPER_CONFIG.get("max_retries", 3),
+                        backoff_factor=SCRAPER_CONFIG.get("retry_backoff", 0.3),
+                        status_forcelist=(429, 502, 503, 504))
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self):
+        if self not in _OPEN_SCRAPERS:
+            return
+        _OPEN_SCRAPERS.discard(self)
+        self.save_seen_tweets()
+        with self._seen_lock:
+            self._seen_conn.close()
+        self._adapter.close()
+        if self.email_notifier:
+            self.email_notifier.close()
+    
+    @property
+    def session(self):
+        # requests.Session isn't safe to share across handle threads, so each gets its own
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': SCRAPER_CONFIG["user_agent"],
+                # urllib3 only advertises br/zstd when it can decode them (brotli installed, zstd support available)
+                'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']
+            })
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
+            self._local.session = session
+        return session
     
     def load_seen_tweets(self):
-        if os.path.exists(self.seen_tweets_file):
+        # IDs live in sqlite, so lookups and inserts don't need the whole history in memory
+        # and a save only commits what changed; rowid order keeps the oldest IDs first
+        conn = sqlite3.connect(self.seen_tweets_db, check_same_thread=False)
+        conn.execute("CREATE TABLE IF NOT EXISTS seen_tweets (tweet_id TEXT PRIMARY KEY)")
+        conn.execute("CREATE TABLE IF NOT EXISTS timeline_validators (handle TEXT PRIMARY KEY, etag TEXT, last_modified TEXT)")
+        if conn.execute("SELECT 1 FROM seen_tweets LIMIT 1").fetchone() is None and os.path.exists(self.seen_tweets_file):
             try:
-                with open(self.seen_tweets_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return set(data.get('seen_tweet_ids', []))
-            except (json.JSONDecodeError, KeyError):
+                with open(self.seen_tweets_file, 'rb') as f:
+                    data = json_loads(f.read())
+                conn.executemany("INSERT OR IGNORE INTO seen_tweets (tweet_id) VALUES (?)",
+                                 ((str(tweet_id),) for tweet_id in data.get('seen_tweet_ids', [])))
+            except (json.JSONDecodeError, AttributeError):
                 print(f"Warning: Could not load seen tweets from {self.seen_tweets_file}. Starting fresh.")
-                return set()
-        return set()
+        conn.commit()
+        return conn
     
     def save_seen_tweets(self):
         try:
-            data = {
-                'seen_tweet_ids': list(self.seen_tweet_ids),
-                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S')
-            }
-            with open(self.seen_tweets_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with self._seen_lock:
+                if not self._pending_seen and not self._pending_validators:
+                    return
+                self._seen_conn.executemany("INSERT OR IGNORE INTO seen_tweets (tweet_id) VALUES (?)",
+                                            ((tweet_id,) for tweet_id in self._pending_seen))
+                self._seen_conn.executemany(
+                    "INSERT OR REPLACE INTO timeline_validators (handle, etag, last_modified) VALUES (?, ?, ?)",
+                    ((handle, etag, last_modified) for handle, (etag, last_modified) in self._pending_validators.items())
+                )
+                max_seen = SCRAPER_CONFIG.get("max_seen_tweets")
+                if max_seen:
+                    self._seen_conn.execute(
+                        "DELETE FROM seen_tweets WHERE rowid <= (SELECT MAX(rowid) FROM seen_tweets) - ?", (max_seen,)
+                    )
+                self._seen_conn.commit()
+                self._pending_seen.clear()
+                self._pending_validators.clear()
         except Exception as e:
             print(f"Error saving seen tweets: {e}")
     
     def is_new_tweet(self, tweet_id):
-        return tweet_id not in self.seen_tweet_ids
+        with self._seen_lock:
+            if tweet_id in self._pending_seen:
+                return False
+            return self._seen_conn.execute("SELECT 1 FROM seen_tweets WHERE tweet_id = ?", (tweet_id,)).fetchone() is None
+    
+    def conditional_headers(self, handle):
+        with self._seen_lock:
+            validators = self._pending_validators.get(handle)
+            if validators is None:
+                validators = self._seen_conn.execute(
+                    "SELECT etag, last_modified FROM timeline_validators WHERE handle = ?", (handle,)
+                ).fetchone() or (None, None)
+        etag, last_modified = validators
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def remember_validators(self, handle, response):
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._seen_lock:
+                self._pending_validators[handle] = (etag, last_modified)
+    
+    def new_tweet_ids(self, tweet_ids):
+        # One IN query per few hundred IDs instead of a lookup per timeline item
+        new_ids = set(tweet_ids)
+        with self._seen_lock:
+            new_ids.difference_update(self._pending_seen)
+            candidates = list(new_ids)
+            for start in range(0, len(candidates), 500):
+                chunk = candidates[start:start + 500]
+                rows = self._seen_conn.execute(
+                    f"SELECT tweet_id FROM seen_tweets WHERE tweet_id IN ({','.join('?' * len(chunk))})", chunk
+                )
+                new_ids.difference_update(row[0] for row in rows)
+        return new_ids
     
     def mark_tweet_as_seen(self, tweet_id):
-        self.seen_tweet_ids.add(tweet_id)
+        with self._seen_lock:
+            self._pending_seen[tweet_id] = None
     
     def extract_tweet_stats(self, tweet_element):
+        return self._parse_stats(tweet_element.find_all('span', class_='tweet-stat'))
+    
+    def _parse_stats(self, stats_elements):
         stats = {}
-        stats_elements = tweet_element.find_all('span', class_='tweet-stat')
-        
         for stat in stats_elements:
-            icon = stat.find('span', class_=lambda x: x and 'icon-' in x)
-            if icon:
-                stat_type = None
-                if 'icon-comment' in icon.get('class', []):
-                    stat_type = 'replies'
-                elif 'icon-retweet' in icon.get('class', []):
-                    stat_type = 'retweets'
-                elif 'icon-quote' in icon.get('class', []):
-                    stat_type = 'quotes'
-                elif 'icon-heart' in icon.get('class', []):
-                    stat_type = 'likes'
-                elif 'icon-play' in icon.get('class', []):
-                    stat_type = 'views'
-                
-                if stat_type:
-                    stat_text = stat.get_text(strip=True)
-                    numbers = re.findall(r'[\\d,]+', stat_text)
-                    if numbers:
-                        stats[stat_type] = numbers[0].replace(',', '')
+            # Plain class lookups instead of a class_ predicate called for every child
+            stat_type = None
+            for node in stat.descendants:
+                if isinstance(node, Tag) and node.name == 'span':
+                    stat_type = next((ICON_TO_STAT[cls] for cls in node.get('class', ()) if cls in ICON_TO_STAT), None)
+                    if stat_type:
+                        break
+            
+            if stat_type:
+                stat_text = element_text(stat)
+                number = NUMBER_RE.search(stat_text)
+                if number:
+                    stats[stat_type] = number.group(0).replace(',', '')
         
         return stats
     
     def extract_quoted_tweet(self, tweet_element):
-        quote = tweet_element.find('div', class_='quote')
+        return self._parse_quote(tweet_element.find('div', class_='quote'))
+    
+    def _parse_quote(self, quote):
         if not quote:
             return None
             
         quoted_tweet = {}
+        # Two walks (quote, then its name row) instead of a find() per field
+        parts = find_parts(quote, QUOTE_PARTS)
         
-        name_row = quote.find('div', class_='tweet-name-row')
+        name_row = parts.get('tweet-name-row')
         if name_row:
-            fullname_elem = name_row.find('a', class_='fullname')
-            username_elem = name_row.find('a', class_='username')
-            date_elem = name_row.find('span', class_='tweet-date')
+            name_parts = find_parts(name_row, HEADER_PARTS)
+            fullname_elem = name_parts.get('fullname')
+            username_elem = name_parts.get('username')
+            date_elem = name_parts.get('tweet-date')
             
             if fullname_elem:
-                quoted_tweet['author'] = fullname_elem.get_text(strip=True)
+                quoted_tweet['author'] = element_text(fullname_elem)
             if username_elem:
-                quoted_tweet['username'] = username_elem.get_text(strip=True)
+                quoted_tweet['username'] = element_text(username_elem)
             if date_elem:
-                quoted_tweet['date'] = date_elem.get_text(strip=True)
-        quote_text = quote.find('div', class_='quote-text')
+                quoted_tweet['date'] = element_text(date_elem)
+        quote_text = parts.get('quote-text')
         if quote_text:
-            quoted_tweet['text'] = quote_text.get_text(strip=True)
-        quote_link = quote.find('a', class_='quote-link')
+            quoted_tweet['text'] = element_text(quote_text)
+        quote_link = parts.get('quote-link')
         if quote_link and quote_link.get('href'):
             quoted_tweet['link'] = quote_link['href']
         
         return quoted_tweet
     
     def extract_media_info(self, tweet_element):
+        return self._parse_attachments(tweet_element.find('div', class_='attachments'))
+    
+    def _parse_attachments(self, attachments):
         media = []
-        attachments = tweet_element.find('div', class_='attachments')
         if attachments:
-            images = attachments.find_all('img')
-            for img in images:
-                if img.get('src'):
+            # One walk over the attachments; a video is the first img inside each video-container
+            videos = []
+            claimed = set()
+            for img in attachments.descendants:
+                if not isinstance(img, Tag) or img.name != 'img':
+                    continue
+                src = img.get('src')
+                if src:
                     media.append({
                         'type': 'image',
-                        'src': img['src'],
+                        'src': src,
                         'alt': img.get('alt', '')
                     })
-            video_containers = attachments.find_all('div', class_='video-container')
-            for video in video_containers:
-                img = video.find('img')
-                if img and img.get('src'):
-                    media.append({
-                        'type': 'video',
-                        'thumbnail': img['src']
-                    })
+                for parent in img.parents:
+                    if parent is attachments:
+                        break
+                    if parent.name == 'div' and 'video-container' in parent.get('class', ()) and id(parent) not in claimed:
+                        claimed.add(id(parent))
+                        if src:
+                            videos.append({
+                                'type': 'video',
+                                'thumbnail': src
+                            })
+            media.extend(videos)
         
         return media
     
+    @staticmethod
+    def _build_settings(handle, handle_config):
+        context = " ".join(handle_config.get("context", f"{handle} content").split())
+        return handle_config.get("min_score", 6), context
+    
+    def handle_settings(self, handle):
+        # (min_score, context) per handle, resolved once instead of on every classification
+        settings = self._settings.get(handle)
+        if settings is None:
+            settings = self._settings[handle] = self._build_settings(handle, self.handles_config.get(handle, {}))
+        return settings
+    
+    def handle_context(self, handle):
+        return self.handle_settings(handle)[1]
+    
     def classify_tweet_importance(self, tweet_data, handle):
-        handle_config = self.handles_config.get(handle, {})
-        min_score = handle_config.get("min_score", 6)
-        context = handle_config.get("context", f"{handle} content")
+        min_score, context = self.handle_settings(handle)
         
         if self.ai_classification and self.classifier.is_ai_available():
             score, reason = self.classifier.classify_tweet(tweet_data, context)
@@ -153,56 +392,128 @@ class TwitterScraper:
         is_important = score >= min_score
         return is_important, score, reason
     
-    def extract_tweets_from_handle(self, handle):
+    def worth_classifying(self, tweet_data, handle_config):
+        # Per-handle filters that reject a tweet before any classifier (or LLM call) sees it
+        if handle_config.get("skip_retweets") and tweet_data.get('is_retweet'):
+            return False
+        return len(tweet_data.get('text', '')) >= handle_config.get("min_text_len", 0)
+    
+    def classify_batch(self, tweets, handle):
+        if not tweets:
+            return []
+        min_score, context = self.handle_settings(handle)
+        
+        for tweet_data in tweets:
+            prepare_tweet(tweet_data)
+        try:
+            if self.ai_classification and self.classifier.is_ai_available():
+                classifications = self.classifier.classify_batch(tweets, context)
+            else:
+                classifications = self.classifier.classify_batch_keyword(tweets)
+                if self.ai_classification:
+                    classifications = [(score, reason + " (AI not available - using keywords)") for score, reason in classifications]
+        finally:
+            # The caller's dicts are left exactly as they were passed in
+            for tweet_data in tweets:
+                strip_prepared(tweet_data)
+        
+        return [(score >= min_score, score, reason) for score, reason in classifications]
+    
+    def read_timeline(self, response):
+        # Stops downloading once enough consecutive tweets are already known;
+        # everything below them on the timeline is older and was seen too
+        stop_after = SCRAPER_CONFIG.get("stop_after_seen", 10)
+        # ... or once the page has more items than will be kept
+        max_items = SCRAPER_CONFIG.get("max_timeline_items", 0)
+        content = bytearray()
+        scan_from = 0
+        consecutive_seen = 0
+        items = 0
+        
+        for chunk in response.iter_content(8192):
+            content += chunk
+            for match in TWEET_LINK_RE.finditer(content, scan_from):
+                scan_from = match.end()
+                items += 1
+                if max_items and items > max_items:
+                    stop = True
+                elif self.is_new_tweet(match.group(1).decode()):
+                    consecutive_seen = 0
+                    stop = False
+                else:
+                    consecutive_seen += 1
+                    stop = stop_after and consecutive_seen >= stop_after
+                if stop:
+                    # Cut before this item so no half-downloaded tweet gets parsed
+                    item_start = content.rfind(b'<div class="timeline-item', 0, match.start())
+                    return bytes(content[:item_start if item_start != -1 else match.start()])
+        return bytes(content)
+    
+    def fetch_timeline(self, handle, save=True):
         try:
             url = f"{SCRAPER_CONFIG['base_url']}/{handle}"
             
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            # An unchanged page (304) only holds tweets that were already seen
+            with self.session.get(url, timeout=10, stream=True, headers=self.conditional_headers(handle)) as response:
+                if response.status_code == 304:
+                    content = b''
+                else:
+                    response.raise_for_status()
+                    content = self.read_timeline(response)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            timeline_items = soup.find_all('div', class_='timeline-item')
+            soup = BeautifulSoup(content, HTML_PARSER, parse_only=TIMELINE_ONLY)
+            # The strainer already dropped everything else, so the top-level tags are the items
+            timeline_items = [node for node in soup.children if isinstance(node, Tag)]
             
             tweets = []
-            new_tweets = []
             skipped_tweets = 0
-            filtered_out = 0
             
+            items = []
             for item in timeline_items:
-                tweet_data = {}
+                # Everything below comes from this one walk over the item
+                parts = find_parts(item, ITEM_PARTS, ITEM_LISTS)
+                tweet_link = parts.get('tweet-link')
+                href = tweet_link.get('href') if tweet_link else None
+                match = STATUS_RE.search(href) if href else None
+                items.append((parts, href, match.group(1) if match else None))
+            # The whole page is checked against the seen store at once
+            new_ids = self.new_tweet_ids(tweet_id for _, _, tweet_id in items if tweet_id)
                 
-                tweet_link = item.find('a', class_='tweet-link')
-                if tweet_link and tweet_link.get('href'):
-                    tweet_data['tweet_url'] = tweet_link['href']
-                    match = re.search(r'/status/(\d+)', tweet_link['href'])
-                    if match:
-                        tweet_data['tweet_id'] = match.group(1)
-                        if not self.is_new_tweet(tweet_data['tweet_id']):
+            for parts, href, tweet_id in items:
+                tweet_data = {}
+                if href:
+                    tweet_data['tweet_url'] = href
+                    if tweet_id:
+                        tweet_data['tweet_id'] = tweet_id
+                        if tweet_id not in new_ids:
                             skipped_tweets += 1
                             continue
-                        self.mark_tweet_as_seen(tweet_data['tweet_id'])
-                retweet_header = item.find('div', class_='retweet-header')
+                        # A repeat of this ID further down the page counts as seen
+                        new_ids.discard(tweet_id)
+                        self.mark_tweet_as_seen(tweet_id)
+                retweet_header = parts.get('retweet-header')
                 tweet_data['is_retweet'] = bool(retweet_header)
                 if retweet_header:
-                    tweet_data['retweet_info'] = retweet_header.get_text(strip=True)
+                    tweet_data['retweet_info'] = element_text(retweet_header)
                 
-                tweet_data['is_pinned'] = bool(item.find('div', class_='pinned'))
-                tweet_header = item.find('div', class_='tweet-header')
+                tweet_data['is_pinned'] = 'pinned' in parts
+                tweet_header = parts.get('tweet-header')
                 if tweet_header:
-                    fullname = tweet_header.find('a', class_='fullname')
-                    username = tweet_header.find('a', class_='username')
-                    tweet_date = tweet_header.find('span', class_='tweet-date')
+                    header_parts = find_parts(tweet_header, HEADER_PARTS)
+                    fullname = header_parts.get('fullname')
+                    username = header_parts.get('username')
+                    tweet_date = header_parts.get('tweet-date')
                     
                     if fullname:
-                        tweet_data['author'] = fullname.get_text(strip=True)
+                        tweet_data['author'] = element_text(fullname)
                     if username:
-                        tweet_data['username'] = username.get_text(strip=True)
+                        tweet_data['username'] = element_text(username)
                     if tweet_date:
-                        tweet_data['date'] = tweet_date.get_text(strip=True)
+                        tweet_data['date'] = element_text(tweet_date)
                         date_link = tweet_date.find('a')
                         if date_link and date_link.get('title'):
                             tweet_data['full_date'] = date_link['title']
-                tweet_content = item.find('div', class_='tweet-content')
+                tweet_content = parts.get('tweet-content')
                 if tweet_content:
                     urls = []
                     for link in tweet_content.find_all('a', href=True):
@@ -210,45 +521,79 @@ class TwitterScraper:
                         if href.startswith('http://') or href.startswith('https://'):
                             urls.append(href)
                     tweet_data['urls'] = urls
-                    tweet_data['text'] = tweet_content.get_text(separator=' ', strip=True)
+                    tweet_data['text'] = element_text(tweet_content, ' ')
                     
-                tweet_data['quoted_tweet'] = self.extract_quoted_tweet(item)
-                tweet_data['media'] = self.extract_media_info(item)
-                tweet_data['stats'] = self.extract_tweet_stats(item)
+                tweet_data['quoted_tweet'] = self._parse_quote(parts.get('quote'))
+                tweet_data['media'] = self._parse_attachments(parts.get('attachments'))
+                tweet_data['stats'] = self._parse_stats(parts['tweet-stat'])
                 
                 tweets.append(tweet_data)
-                is_important, score, reason = self.classify_tweet_importance(tweet_data, handle)
                 
+            # Only a page that parsed cleanly may be answered with 304 next time
+            if response.status_code != 304:
+                self.remember_validators(handle, response)
+            if save:
+                self.save_seen_tweets()
+            
+            return {
+                'handle': handle,
+                'url': url,
+                'scrape_timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'tweets': tweets,
+                'skipped_tweets_count': skipped_tweets
+            }
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Request error for @{handle}: {e}")
+            return None
+        except Exception as e:
+            print(f"Error scraping tweets for @{handle}: {e}")
+            return None
+    
+    def classify_timeline(self, timeline):
+        handle = timeline['handle']
+        try:
+            tweets = timeline['tweets']
+            skipped_tweets = timeline['skipped_tweets_count']
+            new_tweets = []
+            handle_config = self.handles_config.get(handle, {})
+            candidates = [tweet_data for tweet_data in tweets if self.worth_classifying(tweet_data, handle_config)]
+            filtered_out = len(tweets) - len(candidates)
+            # Collected and printed in one call, so handle threads don't interleave their reports
+            report = []
+            
+            for tweet_data, (is_important, score, reason) in zip(candidates, self.classify_batch(candidates, handle)):
+                if not is_important:
+                    filtered_out += 1
+                    continue
+                # Only kept tweets are copied; the fetched timeline stays reusable by another provider's scraper
+                tweet_data = dict(tweet_data)
                 tweet_data['handle'] = handle
                 tweet_data['importance_score'] = score
                 tweet_data['importance_reason'] = reason
                 tweet_data['ai_provider'] = self.ai_provider if self.ai_classification else 'keyword'
                 
-                if is_important:
-                    new_tweets.append(tweet_data)
-                    if score >= 8:
-                        print(f"\\n🚨 HIGH PRIORITY TWEET (@{handle}, Score: {score})")
-                        print(f"   Reason: {reason}")
-                        print(f"   Author: {tweet_data.get('author', 'N/A')}")
-                        print(f"   Text: {tweet_data.get('text', '')[:1000]}...")
-                else:
-                    filtered_out += 1
-            self.save_seen_tweets()
-            handle_config = self.handles_config.get(handle, {})
-            min_score = handle_config.get('min_score', 6)
+                new_tweets.append(tweet_data)
+                if score >= 8:
+                    report.append(f"\n🚨 HIGH PRIORITY TWEET (@{handle}, Score: {score})")
+                    report.append(f"   Reason: {reason}")
+                    report.append(f"   Author: {tweet_data.get('author', 'N/A')}")
+                    report.append(f"   Text: {tweet_data.get('text', '')[:200]}...")
+            min_score = self.handle_settings(handle)[0]
             
-            print(f"\\n📊 SCRAPING SUMMARY (@{handle}):")
-            print(f"   Total tweets on page: {len(tweets)}")
-            print(f"   Already seen (skipped): {skipped_tweets}")
-            print(f"   ✅ Important tweets kept: {len(new_tweets)}")
-            print(f"   ❌ Low-priority filtered: {filtered_out}")
-            print(f"   🤖 AI Provider: {self.ai_provider if self.ai_classification else 'keyword-based'}")
-            print(f"   📈 Min Score Threshold: {min_score}")
+            report.append(f"\n📊 SCRAPING SUMMARY (@{handle}):")
+            report.append(f"   Total tweets on page: {len(tweets)}")
+            report.append(f"   Already seen (skipped): {skipped_tweets}")
+            report.append(f"   ✅ Important tweets kept: {len(new_tweets)}")
+            report.append(f"   ❌ Low-priority filtered: {filtered_out}")
+            report.append(f"   🤖 AI Provider: {self.ai_provider if self.ai_classification else 'keyword-based'}")
+            report.append(f"   📈 Min Score Threshold: {min_score}")
+            print("\n".join(report))
             
             return {
                 'handle': handle,
-                'url': url,
-                'scrape_timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'url': timeline['url'],
+                'scrape_timestamp': timeline['scrape_timestamp'],
                 'tweets_count': len(tweets),
                 'new_tweets_count': len(new_tweets),
                 'skipped_tweets_count': skipped_tweets,
@@ -259,17 +604,54 @@ class TwitterScraper:
                 'handle_config': handle_config
             }
             
-        except requests.exceptions.RequestException as e:
-            print(f"Request error for @{handle}: {e}")
-            return None
         except Exception as e:
-            print(f"Error scraping tweets for @{handle}: {e}")
+            print(f"Error classifying tweets for @{handle}: {e}")
             return None
     
-    def extract_tweets_from_multiple_handles(self, handles=None):
+    def extract_tweets_from_handle(self, handle, save=True):
+        timeline = self.fetch_timeline(handle, save)
+        if timeline is None:
+            return None
+        return self.classify_timeline(timeline)
+    
+    def _map_handles(self, fn, handles):
+        # Handles are independent network-bound jobs; results are still merged in handle order
+        results = {}
+        if handles:
+            max_workers = min(SCRAPER_CONFIG.get("max_workers", 16), len(handles))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(fn, handle): handle for handle in handles}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        return {handle: results.get(handle) for handle in handles}
+    
+    def fetch_timelines(self, handles=None):
         if handles is None:
             handles = list(self.handles_config.keys())
+        # Multi-handle runs commit the seen IDs once, after every handle is done
+        try:
+            return self._map_handles(lambda handle: self.fetch_timeline(handle, save=False), handles)
+        finally:
+            self.save_seen_tweets()
+    
+    def classify_timelines(self, timelines, top_k=None):
+        def classify(handle):
+            timeline = timelines[handle]
+            return self.classify_timeline(timeline) if timeline else None
         
+        handles = list(timelines)
+        return self._combine_results(handles, self._map_handles(classify, handles), top_k)
+    
+    def extract_tweets_from_multiple_handles(self, handles=None, top_k=None):
+        if handles is None:
+            handles = list(self.handles_config.keys())
+        try:
+            results = self._map_handles(lambda handle: self.extract_tweets_from_handle(handle, save=False), handles)
+        finally:
+            self.save_seen_tweets()
+        return self._combine_results(handles, results, top_k)
+        
+    def _combine_results(self, handles, results, top_k=None):
         all_results = []
         combined_tweets = []
         total_stats = {
@@ -280,7 +662,7 @@ class TwitterScraper:
         }
         
         for handle in handles:
-            result = self.extract_tweets_from_handle(handle)
+            result = results.get(handle)
             
             if result:
                 all_results.append(result)
@@ -291,29 +673,39 @@ class TwitterScraper:
             else:
                 print(f"❌ Failed to scrape @{handle}")
         
-        combined_tweets.sort(key=lambda x: x.get('importance_score', 0), reverse=True)
-        if self.email_notifier and self.enable_email_notifications and total_stats['total_important_tweets'] > 0:
-            tweets_by_handle = {}
-            for result in all_results:
-                handle = result['handle']
-                tweets_by_handle[handle] = result['tweets']
-            self.email_notifier.send_batch_notification(tweets_by_handle, total_stats['total_important_tweets'])
-        
-        return {
+        score_of = lambda x: x.get('importance_score', 0)
+        if top_k is not None:
+            # Callers that only want the best few skip sorting everything
+            combined_tweets = heapq.nlargest(top_k, combined_tweets, key=score_of)
+        else:
+            combined_tweets.sort(key=score_of, reverse=True)
+        data = {
             'scrape_timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
             'handles_scraped': handles,
             'individual_results': all_results,
             'combined_tweets': combined_tweets,
             'stats': total_stats
         }
+        self.send_notifications(data)
+        
+        return data
+    
+    def send_notifications(self, data):
+        if not (self.email_notifier and self.enable_email_notifications and data['stats']['total_important_tweets'] > 0):
+            return False
+        
+        tweets_by_handle = {}
+        for result in data['individual_results']:
+            handle = result['handle']
+            tweets_by_handle[handle] = result['tweets']
+        return self.email_notifier.send_batch_notification(tweets_by_handle, data['stats']['total_important_tweets'])
     
     def save_tweets(self, data, filename=None):
         if filename is None:
             filename = SCRAPER_CONFIG["output_file"]
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json(filename, data)
             print(f"📁 Tweets saved to {filename}")
         except Exception as e:
             print(f"Error saving tweets: {e}")
@@ -324,20 +716,20 @@ class TwitterScraper:
             return
         
         stats = data['stats']
-        print(f"\\n{'='*60}")
+        print(f"\n{'='*60}")
         print(f"🎯 MULTI-HANDLE SCRAPING COMPLETE!")
         print(f"   📊 Handles processed: {stats['successful_handles']}/{stats['total_handles']}")
         print(f"   ✅ Total important tweets: {stats['total_important_tweets']}")
         print(f"   ❌ Total filtered tweets: {stats['total_filtered_tweets']}")
         if data['combined_tweets']:
-            print(f"\\n🏆 TOP IMPORTANT TWEETS (All Handles):")
+            print(f"\n🏆 TOP IMPORTANT TWEETS (All Handles):")
             for i, tweet in enumerate(data['combined_tweets'][:5]):
                 score = tweet.get('importance_score', 0)
                 reason = tweet.get('importance_reason', 'Unknown')
                 handle = tweet.get('handle', 'unknown')
                 provider = tweet.get('ai_provider', 'keyword')
                 
-                print(f"\\n--- #{i+1} [@{handle}] [Score: {score}/10 - {provider.upper()}] ---")
+                print(f"\n--- #{i+1} [@{handle}] [Score: {score}/10 - {provider.upper()}] ---")
                 print(f"💡 {reason}")
                 print(f"👤 {tweet.get('author', 'N/A')} ({tweet.get('username', 'N/A')})")
                 print(f"🕒 {tweet.get('date', 'N/A')}")